@@ -1,7 +1,15 @@
 """Minesweeper game package."""
 
 from .game import Minesweeper, CellState, GameStatus
-from .tui import MinesweeperTUI
 
 __version__ = "0.1.0"
-__all__ = ["Minesweeper", "CellState", "GameStatus", "MinesweeperTUI"]
\ No newline at end of file
+__all__ = ["Minesweeper", "CellState", "GameStatus", "MinesweeperTUI"]
+
+
+def __getattr__(name: str) -> object:
+    """Import the TUI lazily so game/solver users don't load rich and termios."""
+    if name == "MinesweeperTUI":
+        from .tui import MinesweeperTUI
+
+        return MinesweeperTUI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
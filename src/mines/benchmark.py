@@ -1,6 +1,9 @@
 # src/mines/benchmark.py
 import sys
 import os
+import random
+import time
+from multiprocessing import Pool
 
 # Make sure package root is importable when running from src/mines/
 _this_dir = os.path.dirname(__file__)  # .../src/mines
@@ -15,12 +18,24 @@ except Exception:
     from solver.guessing_benchmark import run_single_solve
 
 
+def _seed_worker():
+    # forked workers start with a copy of the parent's RNG state; reseed each
+    # one so they don't all play the same boards
+    random.seed(os.getpid() + time.time_ns())
+
+
+def _solve_one(args):
+    rows, cols, mines = args
+    return run_single_solve(rows, cols, mines)
+
+
 def benchmark(name, rows, cols, mines, games=100):
-    wins = 0
-    for i in range(1, games + 1):
-        result = run_single_solve(rows, cols, mines)
-        wins += 1 if result else 0
-        print(f"{name} game {i}/{games} → {'WIN' if result else 'LOSE'}")
+    # games are independent, so spread them over every core
+    with Pool(initializer=_seed_worker) as pool:
+        results = pool.imap_unordered(
+            _solve_one, [(rows, cols, mines)] * games, chunksize=8
+        )
+        wins = sum(1 for result in results if result)
 
     print("\n========== RESULTS ==========")
     print(f"Difficulty: {name}")
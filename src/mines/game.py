@@ -1,8 +1,14 @@
 """Minesweeper game logic module."""
 
 import random
+from collections import deque
 from enum import Enum
 
+try:
+    from .neighbors import NeighborTable, neighbor_table
+except ImportError:
+    from neighbors import NeighborTable, neighbor_table
+
 
 class CellState(Enum):
     """Represents the visual state of a cell on the board."""
@@ -14,6 +20,15 @@ class CellState(Enum):
     FLAGGED = 4
 
 
+# CellState members bound once at module level; Enum attribute access is slow
+# enough to show up in the per-cell loops below
+_FLAGGED: CellState = CellState.FLAGGED
+_COVERED: CellState = CellState.COVERED
+_MINE: CellState = CellState.REVEALED_MINE
+_EMPTY: CellState = CellState.REVEALED_EMPTY
+_NUMBER: CellState = CellState.REVEALED_NUMBER
+
+
 class GameStatus(Enum):
     """Represents the overall status of the game."""
 
@@ -54,6 +69,27 @@ class Minesweeper:
         self.status: GameStatus = GameStatus.PLAYING
         # Flag to defer mine placement until first click (to ensure first click is safe)
         self.first_click: bool = True
+        # Non-mine cells still to be revealed; the game is won when this hits zero
+        self._safe_remaining: int = rows * cols - mines
+        # Number of flagged cells, kept up to date by flag()
+        self._flag_count: int = 0
+        # In-bounds neighbors of every cell, shared by all games of this size
+        self._neighbors: NeighborTable = neighbor_table(rows, cols)
+
+    def reset(self) -> None:
+        """Return the game to a fresh, unplayed board of the same size.
+
+        Clears the existing grids in place rather than allocating new ones, so
+        one instance can be reused across many games.
+        """
+        for r in range(self.rows):
+            self.board[r][:] = [0] * self.cols
+            self.revealed[r][:] = [False] * self.cols
+            self.flagged[r][:] = [False] * self.cols
+        self.status = GameStatus.PLAYING
+        self.first_click = True
+        self._safe_remaining = self.rows * self.cols - self.mines
+        self._flag_count = 0
 
     def place_mines(self, safe_row: int, safe_col: int) -> None:
         """Place mines randomly on the board, avoiding the safe cell.
@@ -62,27 +98,40 @@ class Minesweeper:
             safe_row: Row index of the first clicked cell (must be mine-free)
             safe_col: Column index of the first clicked cell (must be mine-free)
         """
-        mines_placed: int = 0
-        while mines_placed < self.mines:
-            # Generate random coordinates
-            r: int = random.randint(0, self.rows - 1)
-            c: int = random.randint(0, self.cols - 1)
-            # Skip if cell is the safe cell or already has a mine
-            if (r == safe_row and c == safe_col) or self.board[r][c] == -1:
-                continue
+        # Sample distinct flat indices in one call, leaving out the safe cell's
+        # slot by shifting every index at or past it up by one
+        safe_index: int = safe_row * self.cols + safe_col
+        for index in random.sample(range(self.rows * self.cols - 1), self.mines):
+            if index >= safe_index:
+                index += 1
+            r, c = divmod(index, self.cols)
             # Mark cell as a mine (-1 indicates mine)
             self.board[r][c] = -1
-            mines_placed += 1
         # Calculate adjacent mine counts for all non-mine cells
         self._calculate_numbers()
 
     def _calculate_numbers(self) -> None:
-        """Calculate and store the count of adjacent mines for each non-mine cell."""
-        for r in range(self.rows):
-            for c in range(self.cols):
-                # Only calculate for non-mine cells
-                if self.board[r][c] != -1:
-                    self.board[r][c] = self._count_adjacent_mines(r, c)
+        """Calculate and store the count of adjacent mines for each non-mine cell.
+
+        Each mine adds one to its non-mine neighbors, so the whole count map is
+        built in one pass over the mines instead of scanning 8 neighbors of
+        every cell.
+        """
+        board: list[list[int]] = self.board
+        neighbors: NeighborTable = self._neighbors
+        mine_cells: list[tuple[int, int]] = []
+        for r, row in enumerate(board):
+            for c, value in enumerate(row):
+                if value == -1:
+                    mine_cells.append((r, c))
+                else:
+                    # Reset so the counts below start from zero
+                    row[c] = 0
+
+        for r, c in mine_cells:
+            for nr, nc in neighbors[r][c]:
+                if board[nr][nc] != -1:
+                    board[nr][nc] += 1
 
     def _count_adjacent_mines(self, row: int, col: int) -> int:
         """Count the number of mines adjacent to a specific cell.
@@ -94,21 +143,10 @@ class Minesweeper:
         Returns:
             Number of adjacent mines (0-8)
         """
-        count: int = 0
-        # Check all 8 adjacent cells (including diagonals)
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                # Skip the center cell
-                if dr == 0 and dc == 0:
-                    continue
-                nr: int = row + dr
-                nc: int = col + dc
-                # Verify coordinates are within board bounds
-                if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                    # Count if adjacent cell contains a mine
-                    if self.board[nr][nc] == -1:
-                        count += 1
-        return count
+        # Count neighbors that contain a mine
+        return sum(
+            1 for nr, nc in self._neighbors[row][col] if self.board[nr][nc] == -1
+        )
 
     def get_neighbors(self, row: int, col: int) -> list[tuple[int, int]]:
         """Get all valid neighboring cells (8 adjacent cells).
@@ -120,26 +158,14 @@ class Minesweeper:
         Returns:
             List of (row, col) tuples for all valid neighbors
         """
-        neighbors: list[tuple[int, int]] = []
-        # Check all 8 adjacent cells (including diagonals)
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                # Skip the center cell
-                if dr == 0 and dc == 0:
-                    continue
-                nr: int = row + dr
-                nc: int = col + dc
-                # Add only cells within board bounds
-                if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                    neighbors.append((nr, nc))
-        return neighbors
+        return list(self._neighbors[row][col])
 
     def reveal(self, row: int, col: int) -> bool:
         """Reveal a cell and handle cascade effect for empty cells.
 
         On the first click, mines are placed to guarantee the first cell is safe.
         If a revealed cell has no adjacent mines, all unrevealed neighbors are
-        recursively revealed (cascade effect).
+        revealed as well, spreading breadth-first (cascade effect).
 
         Args:
             row: Row index of the cell to reveal
@@ -160,24 +186,59 @@ class Minesweeper:
         if self.revealed[row][col] or self.flagged[row][col]:
             return True
 
+        if not self._reveal_one(row, col):
+            # Revealed a mine (game lost)
+            self.status = GameStatus.LOST
+            return False
+
+        # Check win condition once, after the whole cascade
+        if self._check_win():
+            self.status = GameStatus.WON
+
+        return True
+
+    def _reveal_one(self, row: int, col: int) -> bool:
+        """Reveal a valid, covered, unflagged cell and cascade from it.
+
+        Does no bounds or state checks and never touches the game status;
+        reveal() handles both around it.
+
+        Args:
+            row: Row index of the cell to reveal
+            col: Column index of the cell to reveal
+
+        Returns:
+            True if the cell is safe (non-mine), False if it's a mine
+        """
         # Mark cell as revealed
         self.revealed[row][col] = True
 
-        # Check if cell contains a mine (game lost)
         if self.board[row][col] == -1:
-            self.status = GameStatus.LOST
             return False
+        self._safe_remaining -= 1
 
-        # Cascade effect: recursively reveal all neighbors if cell has no adjacent mines
+        # Cascade effect: flood-fill outward from cells with no adjacent mines,
+        # using an explicit queue instead of recursing once per cell
         if self.board[row][col] == 0:
-            for nr, nc in self.get_neighbors(row, col):
-                # Reveal unrevealed and unflagged neighbors
-                if not self.revealed[nr][nc] and not self.flagged[nr][nc]:
-                    _ = self.reveal(nr, nc)
-
-        # Check win condition after reveal
-        if self._check_win():
-            self.status = GameStatus.WON
+            # Bind the grids to locals and keep the counter local until the
+            # flood is done; this loop is the hottest path in a game
+            board: list[list[int]] = self.board
+            revealed: list[list[bool]] = self.revealed
+            flagged: list[list[bool]] = self.flagged
+            neighbors: NeighborTable = self._neighbors
+            opened: int = 0
+            queue: deque[tuple[int, int]] = deque([(row, col)])
+            while queue:
+                r, c = queue.popleft()
+                for nr, nc in neighbors[r][c]:
+                    # Reveal unrevealed and unflagged neighbors
+                    if not revealed[nr][nc] and not flagged[nr][nc]:
+                        revealed[nr][nc] = True
+                        opened += 1
+                        # Keep spreading through further empty cells
+                        if board[nr][nc] == 0:
+                            queue.append((nr, nc))
+            self._safe_remaining -= opened
 
         return True
 
@@ -193,6 +254,7 @@ class Minesweeper:
             # Only allow flagging unrevealed cells
             if not self.revealed[row][col]:
                 self.flagged[row][col] = not self.flagged[row][col]
+                self._flag_count += 1 if self.flagged[row][col] else -1
 
     def _check_win(self) -> bool:
         """Check if the player has won the game.
@@ -202,14 +264,8 @@ class Minesweeper:
         Returns:
             True if the player has won, False otherwise
         """
-        # Iterate through all cells
-        for r in range(self.rows):
-            for c in range(self.cols):
-                # If any non-mine cell is unrevealed, game is still ongoing
-                if self.board[r][c] != -1 and not self.revealed[r][c]:
-                    return False
-        # All non-mine cells are revealed
-        return True
+        # reveal() keeps the count of unrevealed non-mine cells up to date
+        return self._safe_remaining == 0
 
     def get_cell_state(self, row: int, col: int) -> CellState:
         """Get the current visual state of a cell.
@@ -230,15 +286,15 @@ class Minesweeper:
 
         # Check state in order of priority for display
         if self.flagged[row][col]:
-            return CellState.FLAGGED
+            return _FLAGGED
         if not self.revealed[row][col]:
-            return CellState.COVERED
+            return _COVERED
         if self.board[row][col] == -1:
-            return CellState.REVEALED_MINE
+            return _MINE
         elif self.board[row][col] == 0:
-            return CellState.REVEALED_EMPTY
+            return _EMPTY
         else:
-            return CellState.REVEALED_NUMBER
+            return _NUMBER
 
     def get_cell_value(self, row: int, col: int) -> int | None:
         """Get the numeric value of a revealed cell.
@@ -269,14 +325,32 @@ class Minesweeper:
             and a 2D array of cell states and values for rendering
         """
         cells: list[list[dict[str, object]]] = []
-        # Build 2D array of cell information
-        for r in range(self.rows):
+        # Build 2D array of cell information in a single pass, applying the same
+        # rules as get_cell_state/get_cell_value without their per-cell bounds
+        # checks and repeated indexing
+        for board_row, revealed_row, flagged_row in zip(
+            self.board, self.revealed, self.flagged
+        ):
             row_cells: list[dict[str, object]] = []
-            for c in range(self.cols):
-                # Get both visual state and numeric value for each cell
-                state: CellState = self.get_cell_state(r, c)
-                value: int | None = self.get_cell_value(r, c)
-                row_cells.append({"state": state, "value": value})
+            for value, is_revealed, is_flagged in zip(
+                board_row, revealed_row, flagged_row
+            ):
+                state: CellState
+                if is_flagged:
+                    state = _FLAGGED
+                elif not is_revealed:
+                    state = _COVERED
+                elif value == -1:
+                    state = _MINE
+                elif value == 0:
+                    state = _EMPTY
+                else:
+                    state = _NUMBER
+                # Values are only shown for revealed non-mine cells
+                if not is_revealed or value == -1:
+                    row_cells.append({"state": state, "value": None})
+                else:
+                    row_cells.append({"state": state, "value": value})
             cells.append(row_cells)
 
         return {
@@ -287,6 +361,14 @@ class Minesweeper:
             "cells": cells,
         }
 
+    def get_flag_count(self) -> int:
+        """Get the number of flagged cells.
+
+        Returns:
+            Count of cells currently flagged, without scanning the board
+        """
+        return self._flag_count
+
     def is_game_over(self) -> bool:
         """Check if the game has ended (won or lost).
 
@@ -0,0 +1,35 @@
+"""Neighbor lookup shared by the game and the solvers."""
+
+from functools import lru_cache
+
+# (row, col) offsets of the 8 cells surrounding a cell
+NEIGHBOR_OFFSETS: tuple[tuple[int, int], ...] = (
+    (-1, -1), (-1, 0), (-1, 1),
+    (0, -1),           (0, 1),
+    (1, -1),  (1, 0),  (1, 1),
+)
+
+# table[r][c] -> (row, col) neighbors of cell (r, c)
+NeighborTable = tuple[tuple[tuple[tuple[int, int], ...], ...], ...]
+
+
+@lru_cache(maxsize=8)
+def neighbor_table(rows: int, cols: int) -> NeighborTable:
+    """Return the in-bounds neighbors of every cell for a board geometry.
+
+    table[r][c] holds the (row, col) neighbors of (r, c), so edge and corner
+    cells are settled here once instead of bounds-checking on every lookup.
+    Cached, so every game and solver call on the same board size shares one
+    table.
+    """
+    return tuple(
+        tuple(
+            tuple(
+                (r + dr, c + dc)
+                for dr, dc in NEIGHBOR_OFFSETS
+                if 0 <= r + dr < rows and 0 <= c + dc < cols
+            )
+            for c in range(cols)
+        )
+        for r in range(rows)
+    )
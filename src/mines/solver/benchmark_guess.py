@@ -17,21 +17,29 @@ def auto_best_guess(probabilities, revealed, flagged):
     if not probabilities:
         return None, None
 
-    # Hidden and unflagged only
-    hidden = [
-        cell for cell in probabilities.keys()
-        if not revealed[cell[0]][cell[1]] and not flagged[cell[0]][cell[1]]
-    ]
-
-    if not hidden:
-        return None, None
-
-    # Lowest probability
-    min_prob = min(probabilities[cell] for cell in hidden)
-
-    best_cells = [
-        cell for cell in hidden
-        if probabilities[cell] == min_prob
-    ]
-
-    return random.choice(best_cells), min_prob
+    # Hidden and unflagged only, lowest probability in a single pass; ties are
+    # broken by reservoir sampling, which picks uniformly like random.choice
+    # without collecting the tied cells into a list
+    best_cell = None
+    min_prob = None
+    ties = 0
+
+    for cell, prob in probabilities.items():
+        r, c = cell
+        if revealed[r][c] or flagged[r][c]:
+            continue
+
+        # a certainly-safe cell can't be beaten
+        if prob == 0:
+            return cell, prob
+
+        if min_prob is None or prob < min_prob:
+            min_prob = prob
+            best_cell = cell
+            ties = 1
+        elif prob == min_prob:
+            ties += 1
+            if random.random() * ties < 1:
+                best_cell = cell
+
+    return best_cell, min_prob
@@ -1,96 +1,128 @@
 # COUNT-BASED SOLVER
 
-from collections import deque
+try:
+    from ..neighbors import neighbor_table
+except ImportError:
+    from neighbors import neighbor_table
 
 def get_hidden_regions(board, revealed):
     """Return list of connected components of hidden cells."""
-    rows = len(board)
-    cols = len(board[0])
     rows, cols = len(board), len(board[0])
-    visited = set()
-    regions = []
 
+    # Bitboard flood fill: bit r * cols + c stands for cell (r, c), so growing a
+    # region by one ring of neighbors is a handful of shifts over the whole board
+    hidden = 0
     for r in range(rows):
         for c in range(cols):
-            if not revealed[r][c] and (r, c) not in visited:
-                # BFS for region
-                queue = deque([(r, c)])
-                region = set([(r, c)])
-                visited.add((r, c))
-
-                while queue:
-                    x, y = queue.popleft()
-                    for dr in (-1, 0, 1):
-                        for dc in (-1, 0, 1):
-                            if dr == 0 and dc == 0:
-                                continue
-                            nx, ny = x + dr, y + dc
-                            if 0 <= nx < rows and 0 <= ny < cols:
-                                if not revealed[nx][ny] and (nx, ny) not in visited:
-                                    visited.add((nx, ny))
-                                    region.add((nx, ny))
-                                    queue.append((nx, ny))
-
-                regions.append(region)
+            if not revealed[r][c]:
+                hidden |= 1 << (r * cols + c)
+
+    first_col = 0
+    for r in range(rows):
+        first_col |= 1 << (r * cols)
+    # keep shifted bits on the board and off the wrapped-around column
+    board_mask = (1 << (rows * cols)) - 1
+    not_first_col = board_mask & ~first_col
+    not_last_col = board_mask & ~(first_col << (cols - 1))
+
+    regions = []
+    remaining = hidden
+    while remaining:
+        region = remaining & -remaining
+        while True:
+            wide = (region
+                    | ((region << 1) & not_first_col)
+                    | ((region >> 1) & not_last_col))
+            grown = (wide | (wide << cols) | (wide >> cols)) & remaining
+            if grown == region:
+                break
+            region = grown
+        remaining &= ~region
+
+        cells = set()
+        while region:
+            low = region & -region
+            cells.add(divmod(low.bit_length() - 1, cols))
+            region ^= low
+        regions.append(cells)
 
     return regions
 
 
-def required_mines_in_region(region, board, revealed, flagged):
-    """Return how many mines MUST be in this region, based on adjacent numbers."""
-    rows = len(board)
-    cols = len(board[0])
-    required = 0
+def unaccounted_mines(board, revealed, flagged):
+    """Return {(r, c): mines} for every revealed number still missing mines.
+
+    mines is the number minus its flagged neighbors; numbers that are already
+    satisfied are left out.
+    """
+    rows, cols = len(board), len(board[0])
+    neighbors = neighbor_table(rows, cols)
+    number_need = {}
+    for r in range(rows):
+        # row lists fetched once per row rather than double-indexed per cell
+        board_row = board[r]
+        revealed_row = revealed[r]
+        neighbor_row = neighbors[r]
+
+        for c in range(cols):
+            number = board_row[c]
+            if number > 0 and revealed_row[c]:
+                # board number minus flagged neighbors gives unaccounted mines
+                flagged_count = 0
+                for nr, nc in neighbor_row[c]:
+                    if flagged[nr][nc]:
+                        flagged_count += 1
+
+                unaccounted = number - flagged_count
+                if unaccounted > 0:
+                    number_need[(r, c)] = unaccounted
+
+    return number_need
+
+
+def required_mines_in_region(region, board, revealed, flagged, rows=None, cols=None,
+                             number_need=None):
+    """Return how many mines MUST be in this region, based on adjacent numbers.
+
+    rows/cols and number_need (the unaccounted_mines() map) can be passed in so
+    a caller looping over regions works them out once.
+    """
+    if rows is None or cols is None:
+        rows, cols = len(board), len(board[0])
+    if number_need is None:
+        number_need = unaccounted_mines(board, revealed, flagged)
+    neighbors = neighbor_table(rows, cols)
+
+    # every bordering number counts once, however many region cells it touches
+    bordering = set()
     for (r, c) in region:
-        # Check neighbors
-        for dr in (-1, 0, 1):
-            for dc in (-1, 0, 1):
-                if dr == 0 and dc == 0:
-                    continue
-
-                nr = r + dr
-                nc = c + dc
-
-                if 0 <= nr < len(board) and 0 <= nc < len(board[0]):
-                    if revealed[nr][nc] and board[nr][nc] > 0:
-                        # board number minus flagged neighbors gives unaccounted mines
-                        mines_left = board[nr][nc]
-
-                        flagged_count = 0
-                        hidden_count = 0
-
-                        for x in (-1, 0, 1):
-                            for y in (-1, 0, 1):
-                                rr = nr + x
-                                cc = nc + y
-                                if 0 <= rr < len(board) and 0 <= cc < len(board[0]):
-                                    if flagged[rr][cc]:
-                                        flagged_count += 1
-                                    elif not revealed[rr][cc]:
-                                        hidden_count += 1
-
-                        unaccounted = mines_left - flagged_count
-                        if unaccounted > 0:
-                            # distribute unaccounted mines evenly among region?
-                            required += unaccounted
-
-    return max(0, required)
-
-
-def count_next_move(board, revealed, flagged, total_mines):
-    """Find safe moves using global count logic."""
-    rows = len(board)
-    cols = len(board[0])
+        for cell in neighbors[r][c]:
+            if cell in number_need:
+                bordering.add(cell)
+
+    return sum(number_need[cell] for cell in bordering)
+
+
+def count_next_move(board, revealed, flagged, total_mines, flagged_count=None):
+    """Find safe moves using global count logic.
+
+    flagged_count can be passed in (Minesweeper.get_flag_count()) to skip
+    counting the flags on the board.
+    """
     rows, cols = len(board), len(board[0])
 
-    flagged_count = sum(sum(row) for row in flagged)
+    if flagged_count is None:
+        flagged_count = sum(map(sum, flagged))
     remaining_mines = total_mines - flagged_count
 
     regions = get_hidden_regions(board, revealed)
 
+    number_need = unaccounted_mines(board, revealed, flagged)
     region_mine_sum = 0
     for region in regions:
-        region_mine_sum += required_mines_in_region(region, board, revealed, flagged)
+        region_mine_sum += required_mines_in_region(
+            region, board, revealed, flagged, rows, cols, number_need
+        )
 
     safe_moves = set()
 
@@ -108,3 +140,27 @@ def count_next_move(board, revealed, flagged, total_mines):
         safe_moves = all_hidden - combined
 
     return safe_moves
+
+
+def endgame_next_move(board, revealed, flagged, total_mines, flagged_count=None):
+    """Settle every hidden cell at once when the mine count alone decides it.
+
+    With no mines left, every hidden cell is safe; with as many mines left as
+    hidden cells, every hidden cell is a mine. Returns (safe, mines).
+    """
+    if flagged_count is None:
+        flagged_count = sum(map(sum, flagged))
+    remaining_mines = total_mines - flagged_count
+
+    hidden = {(r, c)
+              for r, (revealed_row, flagged_row) in enumerate(zip(revealed, flagged))
+              for c, (is_revealed, is_flagged) in enumerate(zip(revealed_row, flagged_row))
+              if not is_revealed and not is_flagged}
+
+    if not hidden:
+        return set(), set()
+    if remaining_mines == 0:
+        return hidden, set()
+    if remaining_mines == len(hidden):
+        return set(), hidden
+    return set(), set()
@@ -90,39 +90,50 @@
 #     return safe_moves, mine_moves, probabilities
 
 # New method
-from itertools import product
+from functools import lru_cache
+
+try:
+    from ..neighbors import neighbor_table
+except ImportError:
+    from neighbors import neighbor_table
 
 class Group:
     def __init__(self, cells, mines):
-        self.cells = set(cells)
+        self.cells = frozenset(cells)   # flat cell ids, r * cols + c
         self.mines = mines
 
 
 def extract_groups(board, revealed, flagged):
+    """Return one Group per revealed number that still borders hidden cells.
+
+    Cells are flat ids r * cols + c rather than (r, c) tuples: ints hash and
+    compare cheaper in all the set work below. divmod(cell, cols) turns one
+    back into (r, c).
+    """
     rows, cols = len(board), len(board[0])
+    neighbors = neighbor_table(rows, cols)
     groups = []
 
     for r in range(rows):
+        # row lists fetched once per row rather than double-indexed per cell
+        board_row = board[r]
+        revealed_row = revealed[r]
+        neighbor_row = neighbors[r]
+
         for c in range(cols):
-            if revealed[r][c] and board[r][c] > 0:
+            number = board_row[c]
+            if number > 0 and revealed_row[c]:
 
                 hidden = []
                 flagged_count = 0
 
-                for dr in (-1, 0, 1):
-                    for dc in (-1, 0, 1):
-                        if dr == 0 and dc == 0:
-                            continue
+                for nr, nc in neighbor_row[c]:
+                    if flagged[nr][nc]:
+                        flagged_count += 1
+                    elif not revealed[nr][nc]:
+                        hidden.append(nr * cols + nc)
 
-                        nr = r + dr
-                        nc = c + dc
-                        if 0 <= nr < rows and 0 <= nc < cols:
-                            if flagged[nr][nc]:
-                                flagged_count += 1
-                            elif not revealed[nr][nc]:
-                                hidden.append((nr, nc))
-
-                need = board[r][c] - flagged_count
+                need = number - flagged_count
                 if need >= 0 and hidden:
                     groups.append(Group(hidden, need))
 
@@ -130,69 +141,131 @@ def extract_groups(board, revealed, flagged):
 
 
 def build_clusters(groups):
-    clusters = []
-    used = set()
-
-    for i, g in enumerate(groups):
-        if i in used:
-            continue
-
-        # start new cluster
-        cluster = [g]
-        queue = [g]
-        used.add(i)
-
-        while queue:
-            cur = queue.pop()
-            for j, other in enumerate(groups):
-                if j in used:
-                    continue
-                if cur.cells & other.cells:  # overlap
-                    used.add(j)
-                    queue.append(other)
-                    cluster.append(other)
-
-        clusters.append(cluster)
-
-    return clusters
+    """Split groups into clusters of groups that (transitively) share cells.
+
+    Union-find over cells: every group unions its cells together, then groups
+    are bucketed by the root of their first cell.
+    """
+    parent = {}
+
+    def find(cell):
+        root = cell
+        while parent[root] != root:
+            root = parent[root]
+        # path compression
+        while parent[cell] != root:
+            parent[cell], cell = root, parent[cell]
+        return root
+
+    for g in groups:
+        cells = iter(g.cells)
+        first = next(cells)
+        parent.setdefault(first, first)
+        root = find(first)
+        for cell in cells:
+            parent.setdefault(cell, cell)
+            other = find(cell)
+            if other != root:
+                parent[other] = root
+
+    clusters = {}
+    for g in groups:
+        clusters.setdefault(find(next(iter(g.cells))), []).append(g)
+
+    return list(clusters.values())
+
+
+def simplify(constraints):
+    """Apply the cheap deductions to (cells, need) constraints until stable.
+
+    need == 0 makes every cell safe, need == len(cells) makes every cell a mine,
+    and a constraint A inside B turns B into (B - A, need_B - need_A). The
+    result has the same solutions as the input, over fewer cells.
+
+    Returns (constraints, safe, mines), or None if the constraints contradict
+    each other.
+    """
+    constraints = {(frozenset(cells), need) for cells, need in constraints}
+    safe = set()
+    mines = set()
+
+    changed = True
+    while changed:
+        changed = False
+
+        # forced cells
+        for cells, need in constraints:
+            if need == 0:
+                safe |= cells
+            elif need == len(cells):
+                mines |= cells
+        if safe & mines:
+            return None
+
+        # strip known cells out of every constraint
+        reduced = set()
+        for cells, need in constraints:
+            new_cells = cells - safe - mines
+            new_need = need - len(cells & mines)
+            if new_need < 0 or new_need > len(new_cells):
+                return None
+            if new_cells:
+                reduced.add((new_cells, new_need))
+        if reduced != constraints:
+            changed = True
+        constraints = reduced
+
+        # subset reduction, smallest constraints first
+        ordered = sorted(constraints, key=lambda con: len(con[0]))
+        for i, (small, small_need) in enumerate(ordered):
+            for j in range(i + 1, len(ordered)):
+                big, big_need = ordered[j]
+                if small < big:
+                    ordered[j] = (big - small, big_need - small_need)
+                    changed = True
+        constraints = set(ordered)
+
+    return constraints, safe, mines
 
 
 def solve_cluster_csp(cluster):
     """Solve CSP for a single cluster of groups."""
-    # hidden cells = union of all groups in this cluster
-    hidden_cells = set()
-    for g in cluster:
-        hidden_cells |= g.cells
-    hidden_cells = list(hidden_cells)
+    simplified = simplify((g.cells, g.mines) for g in cluster)
+    if simplified is None:
+        return {}, set(), set()
+    constraints, forced_safe, forced_mines = simplified
 
-    # build constraints
-    constraints = [(g.cells, g.mines) for g in cluster]
+    probabilities = {cell: 0.0 for cell in forced_safe}
+    probabilities.update((cell, 1.0) for cell in forced_mines)
 
-    n = len(hidden_cells)
-    if n > 20:
-        return {}, set(), set()  # too big, skip (repo uses fallback)
+    # hidden cells = union of what is left undecided
+    hidden_cells = set()
+    for cells, _ in constraints:
+        hidden_cells |= cells
+    # sorted (row-major), so the same local shape gets the same numbering anywhere
+    hidden_cells = sorted(hidden_cells)
 
-    assignments = []
+    n = len(hidden_cells)
+    # the pruned search handles clusters well past the old 2^20 brute-force
+    # limit; beyond 30 cells only the forced cells are known (repo uses fallback)
+    if n > 30:
+        return probabilities, set(forced_safe), set(forced_mines)
 
-    def valid(assign):
-        mapping = {hidden_cells[i]: assign[i] for i in range(n)}
-        for cells, need in constraints:
-            if sum(mapping[cell] for cell in cells) != need:
-                return False
-        return True
+    # build constraints over local cell ids 0..n-1
+    index = {cell: i for i, cell in enumerate(hidden_cells)}
+    signature = tuple(sorted(
+        (tuple(sorted(index[cell] for cell in cells)), need)
+        for cells, need in constraints
+    ))
 
-    for bits in product([0, 1], repeat=n):
-        if valid(bits):
-            assignments.append(bits)
+    mine_counts, total = _solve_signature(signature, n)
 
-    if not assignments:
+    if not total:
         return {}, set(), set()
 
     # probability per cell
-    probabilities = {}
     for i, cell in enumerate(hidden_cells):
-        mine_count = sum(a[i] for a in assignments)
-        probabilities[cell] = mine_count / len(assignments)
+        probabilities[cell] = mine_counts[i] / total
 
     safe = {cell for cell, p in probabilities.items() if p == 0}
     mines = {cell for cell, p in probabilities.items() if p == 1}
@@ -200,8 +273,18 @@ def solve_cluster_csp(cluster):
     return probabilities, safe, mines
 
 
-def csp_next_move(board, revealed, flagged):
-    groups = extract_groups(board, revealed, flagged)
+def csp_next_move(board, revealed, flagged, groups=None):
+    """Return (safe, mines, probabilities) for the current board.
+
+    groups can be passed in if extract_groups() has already been run on this
+    board, e.g. for the grouping solver.
+    """
+    cols = len(board[0])
+    if groups is None:
+        groups = extract_groups(board, revealed, flagged)
+    if not groups:
+        # nothing on the frontier constrains any cell, so there is nothing to solve
+        return set(), set(), {}
     clusters = build_clusters(groups)
 
     final_prob = {}
@@ -214,4 +297,69 @@ def csp_next_move(board, revealed, flagged):
         safe_moves |= safe
         mine_moves |= mines
 
+    # back to (r, c) for callers
+    safe_moves = {divmod(cell, cols) for cell in safe_moves}
+    mine_moves = {divmod(cell, cols) for cell in mine_moves}
+    final_prob = {divmod(cell, cols): p for cell, p in final_prob.items()}
+
     return safe_moves, mine_moves, final_prob
+
+
+@lru_cache(maxsize=4096)
+def _solve_signature(constraints, n):
+    """Count solutions of a canonical cluster.
+
+    constraints is a sorted tuple of (cell_ids, need) over local ids 0..n-1.
+    Returns (mine_counts, total): per cell, how many solutions put a mine
+    there, and the number of solutions. Cached, since the same small shapes
+    come up again and again across turns and games.
+    """
+    # which constraints touch each cell
+    cell_constraints = [[] for _ in range(n)]
+    need_left = []
+    unassigned = []
+    for k, (cells, need) in enumerate(constraints):
+        for i in cells:
+            cell_constraints[i].append(k)
+        need_left.append(need)
+        unassigned.append(len(cells))
+
+    # assign the most constrained cells first so dead branches fail early
+    order = sorted(range(n), key=lambda i: -len(cell_constraints[i]))
+    touching_at = [tuple(cell_constraints[i]) for i in order]
+
+    mine_counts = [0] * n
+
+    def search(pos):
+        """Return the number of solutions below this point of the search.
+
+        A cell set to a mine is credited with every solution of its subtree
+        on the way back up, so a solution costs O(1) rather than a pass over
+        all n cells.
+        """
+        if pos == n:
+            return 1
+
+        touching = touching_at[pos]
+        found = 0
+        for value in (0, 1):
+            ok = True
+            for k in touching:
+                unassigned[k] -= 1
+                need_left[k] -= value
+                # prune: too many mines, or too few cells left to reach need
+                if need_left[k] < 0 or need_left[k] > unassigned[k]:
+                    ok = False
+            if ok:
+                count = search(pos + 1)
+                if value:
+                    mine_counts[order[pos]] += count
+                found += count
+            for k in touching:
+                unassigned[k] += 1
+                need_left[k] += value
+        return found
+
+    total = search(0)
+
+    return tuple(mine_counts), total
@@ -98,64 +98,119 @@
 #     return safe_moves, mine_moves
 
 # updated method 
+from collections import deque
+
+try:
+    from ..neighbors import neighbor_table
+except ImportError:
+    from neighbors import neighbor_table
+
 # Strategy 2: Grouping-based solver (final, safe, optimized)
 
+# Cells are tracked as bits of a plain int: every hidden cell next to a
+# number gets an index, so subset / difference / size are single int ops.
+
 class Group:
-    def __init__(self, cells, mines):
-        self.cells = set(cells)
+    __slots__ = ("mask", "mines")
+
+    def __init__(self, mask, mines):
+        self.mask = mask
         self.mines = mines
 
     def copy(self):
-        return Group(set(self.cells), self.mines)
+        return Group(self.mask, self.mines)
 
     def signature(self):
-        return (frozenset(self.cells), self.mines)
+        return (self.mask, self.mines)
 
     def __repr__(self):
-        return f"Group({self.cells}, mines={self.mines})"
+        return f"Group({self.mask:#b}, mines={self.mines})"
 
 
-def build_groups(board, revealed, flagged):
+def build_groups(board, revealed, flagged, constraints=None):
+    """Return (groups, cells) where bit i of a group mask is cells[i].
+
+    constraints, if given, is csp.extract_groups() output for the same board
+    (cells as flat ids r * cols + c); the groups are then built from it
+    instead of scanning the board again.
+    """
     groups = []
+    cells = []
+    cell_to_bit = {}
     rows, cols = len(board), len(board[0])
 
+    if constraints is not None:
+        for con in constraints:
+            mask = 0
+            for cell in sorted(con.cells):
+                bit = cell_to_bit.get(cell)
+                if bit is None:
+                    bit = cell_to_bit[cell] = len(cells)
+                    cells.append(divmod(cell, cols))
+                mask |= 1 << bit
+            groups.append(Group(mask, con.mines))
+        return groups, cells
+
+    neighbors = neighbor_table(rows, cols)
+
     for r in range(rows):
+        board_row = board[r]
+        revealed_row = revealed[r]
+        neighbor_row = neighbors[r]
+
         for c in range(cols):
-            if not revealed[r][c]:
+            if not revealed_row[c]:
                 continue
-            number = board[r][c]
+            number = board_row[c]
             if number <= 0:
                 continue
 
-            hidden = []
+            mask = 0
             flagged_count = 0
 
-            for dr in (-1, 0, 1):
-                for dc in (-1, 0, 1):
-                    if dr == 0 and dc == 0:
-                        continue
-                    nr, nc = r + dr, c + dc
-                    if 0 <= nr < rows and 0 <= nc < cols:
-                        if flagged[nr][nc]:
-                            flagged_count += 1
-                        elif not revealed[nr][nc]:
-                            hidden.append((nr, nc))
+            for cell in neighbor_row[c]:
+                nr, nc = cell
+                if flagged[nr][nc]:
+                    flagged_count += 1
+                elif not revealed[nr][nc]:
+                    bit = cell_to_bit.get(cell)
+                    if bit is None:
+                        bit = cell_to_bit[cell] = len(cells)
+                        cells.append(cell)
+                    mask |= 1 << bit
 
             mines_left = number - flagged_count
 
-            if hidden:
-                groups.append(Group(hidden, mines_left))
+            if mask:
+                groups.append(Group(mask, mines_left))
 
-    return groups
+    return groups, cells
 
 
-def prune_groups(groups):
-    """Remove empty or duplicate groups."""
-    seen = set()
+def mask_to_cells(mask, cells):
+    """Convert a bitmask back into a set of (r, c) cells."""
+    return {cells[bit] for bit in _bits(mask)}
+
+
+def _bits(mask):
+    """Yield the index of every set bit in mask."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def prune_groups(groups, seen=None):
+    """Remove empty or duplicate groups.
+
+    Signatures of the kept groups are recorded in seen, if given.
+    """
+    if seen is None:
+        seen = set()
     pruned = []
 
     for g in groups:
-        if len(g.cells) == 0:
+        if not g.mask:
             continue
         sig = g.signature()
         if sig not in seen:
@@ -165,83 +220,119 @@ def prune_groups(groups):
     return pruned
 
 
-def reduce_groups(groups, safe_moves, mine_moves):
-    """Apply found safes/mines to all groups."""
-    result = []
-
-    for g in groups:
-        new_cells = set()
-        new_mines = g.mines
-
-        for cell in g.cells:
-            if cell in safe_moves:
+def grouping_next_move(board, revealed, flagged, constraints=None):
+    groups, cells = build_groups(board, revealed, flagged, constraints)
+    seen = set()
+    groups = prune_groups(groups, seen)
+
+    safe_mask = 0
+    mine_mask = 0
+
+    # cell bit -> indices of groups that (once) contained it
+    by_cell = {}
+    for idx, g in enumerate(groups):
+        _index_group(by_cell, idx, g.mask)
+
+    # only groups that are new or have shrunk need re-pairing
+    work = deque(range(len(groups)))
+    queued = [True] * len(groups)
+
+    def push(idx):
+        if not queued[idx]:
+            queued[idx] = True
+            work.append(idx)
+
+    def add_group(mask, mines):
+        sig = (mask, mines)
+        if sig in seen:
+            return
+        seen.add(sig)
+        groups.append(Group(mask, mines))
+        queued.append(False)
+        _index_group(by_cell, len(groups) - 1, mask)
+        push(len(groups) - 1)
+
+    def resolve(mask, is_mine):
+        """Remove newly known cells from every group that contains them."""
+        nonlocal safe_mask, mine_mask
+        mask &= ~(safe_mask | mine_mask)
+        if not mask:
+            return
+        if is_mine:
+            mine_mask |= mask
+        else:
+            safe_mask |= mask
+
+        touched = set()
+        for bit in _bits(mask):
+            touched.update(by_cell[bit])
+        for idx in touched:
+            g = groups[idx]
+            hit = g.mask & mask
+            if not hit:
                 continue
-            if cell in mine_moves:
-                new_mines -= 1
-            else:
-                new_cells.add(cell)
+            g.mask ^= hit
+            if is_mine:
+                g.mines -= hit.bit_count()
+            if g.mines < 0:
+                g.mask = 0   # inconsistent, drop it
+            elif g.signature() in seen:
+                g.mask = 0   # shrank into a group we already have
+            elif g.mask:
+                seen.add(g.signature())
+                push(idx)
+
+    while work:
+        i = work.popleft()
+        queued[i] = False
+        A = groups[i]
+        if not A.mask:
+            continue
 
-        if new_mines < 0:
+        # a shrunk group may now be fully decided on its own
+        if A.mines == 0:
+            resolve(A.mask, False)
             continue
-        if len(new_cells) == 0:
+        if A.mines == A.mask.bit_count():
+            resolve(A.mask, True)
             continue
 
-        result.append(Group(new_cells, new_mines))
-
-    return prune_groups(result)
-
-
-def grouping_next_move(board, revealed, flagged):
-    groups = build_groups(board, revealed, flagged)
-
-    safe_moves = set()
-    mine_moves = set()
+        candidates = set()
+        for bit in _bits(A.mask):
+            candidates.update(by_cell[bit])
+        candidates.discard(i)
 
-    changed = True
-    iteration_limit = 30   # prevents infinite loops
-
-    while changed and iteration_limit > 0:
-        iteration_limit -= 1
-        changed = False
-
-        groups = reduce_groups(groups, safe_moves, mine_moves)
-
-        n = len(groups)
-        for i in range(n):
-            for j in range(i + 1, n):
-                A = groups[i]
-                B = groups[j]
+        for j in candidates:
+            B = groups[j]
+            if not A.mask or not B.mask:
+                continue
 
-                # try A ⊂ B
-                if A.cells.issubset(B.cells):
-                    rem = B.cells - A.cells
-                    diff = B.mines - A.mines
+            # only the smaller group can be a proper subset of the other
+            a_size = A.mask.bit_count()
+            b_size = B.mask.bit_count()
+            if a_size < b_size:
+                sub, sup = A, B
+            elif b_size < a_size:
+                sub, sup = B, A
+            else:
+                continue
 
-                    if diff == 0:
-                        safe_moves |= rem
-                        changed = True
-                    elif diff == len(rem):
-                        mine_moves |= rem
-                        changed = True
-                    elif 0 < diff < len(rem):
-                        groups.append(Group(rem, diff))
-                        changed = True
+            if sub.mask & ~sup.mask:
+                continue
+            rem = sup.mask & ~sub.mask
+            diff = sup.mines - sub.mines
+            size = rem.bit_count()
 
-                # try B ⊂ A
-                if B.cells.issubset(A.cells):
-                    rem = A.cells - B.cells
-                    diff = A.mines - B.mines
+            if diff == 0:
+                resolve(rem, False)
+            elif diff == size:
+                resolve(rem, True)
+            elif 0 < diff < size:
+                add_group(rem, diff)
 
-                    if diff == 0:
-                        safe_moves |= rem
-                        changed = True
-                    elif diff == len(rem):
-                        mine_moves |= rem
-                        changed = True
-                    elif 0 < diff < len(rem):
-                        groups.append(Group(rem, diff))
-                        changed = True
+    return mask_to_cells(safe_mask, cells), mask_to_cells(mine_mask, cells)
 
-        groups = prune_groups(groups)
 
-    return safe_moves, mine_moves
+def _index_group(by_cell, idx, mask):
+    for bit in _bits(mask):
+        by_cell.setdefault(bit, []).append(idx)
@@ -13,28 +13,50 @@ try:
     from mines.game import Minesweeper, GameStatus
     from mines.solver.naive import naive_next_move
     from mines.solver.grouping import grouping_next_move
-    from mines.solver.count import count_next_move
-    from mines.solver.csp import csp_next_move
+    from mines.solver.count import count_next_move, endgame_next_move
+    from mines.solver.csp import csp_next_move, extract_groups
     from benchmark_guess import auto_best_guess
 except Exception:
     # Running inside src/mines folder (or similar) — import relative modules
     from game import Minesweeper, GameStatus
     from solver.naive import naive_next_move
     from solver.grouping import grouping_next_move
-    from solver.count import count_next_move
-    from solver.csp import csp_next_move
+    from solver.count import count_next_move, endgame_next_move
+    from solver.csp import csp_next_move, extract_groups
     from solver.benchmark_guess import auto_best_guess
 
 
+# one reusable game per difficulty, reset between runs instead of rebuilt
+_games = {}
+
+
 def run_single_solve(rows, cols, mines):
     """Run one full game automatically until win/lose and return True/False."""
-    game = Minesweeper(rows, cols, mines)
+    game = _games.get((rows, cols, mines))
+    if game is None:
+        game = _games[(rows, cols, mines)] = Minesweeper(rows, cols, mines)
+    else:
+        game.reset()
 
     while True:
         board = game.board
         revealed = game.revealed
         flagged = game.flagged
 
+        # Endgame — the mine count alone may settle every hidden cell; same
+        # order as solver_next_move and the TUI, so results match auto mode
+        safe, mines_found = endgame_next_move(
+            board, revealed, flagged, game.mines, game.get_flag_count()
+        )
+        if safe or mines_found:
+            for r, c in safe:
+                game.reveal(r, c)
+            for r, c in mines_found:
+                game.flag(r, c)
+            if game.is_game_over():
+                break
+            continue
+
         # Strategy 1 — Naive
         safe, mines_found = naive_next_move(board, revealed, flagged)
         if safe or mines_found:
@@ -46,8 +68,14 @@ def run_single_solve(rows, cols, mines):
                 break
             continue
 
+        # Grouping and CSP read the same frontier constraints; the board doesn't
+        # change between them, so extract those once for this turn
+        constraints = extract_groups(board, revealed, flagged)
+
         # Strategy 2 — Grouping
-        safe, mines_found = grouping_next_move(board, revealed, flagged)
+        safe, mines_found = grouping_next_move(
+            board, revealed, flagged, constraints
+        )
         if safe or mines_found:
             for r, c in safe:
                 game.reveal(r, c)
@@ -58,7 +86,9 @@ def run_single_solve(rows, cols, mines):
             continue
 
         # Strategy 3 — Count
-        safe = count_next_move(board, revealed, flagged, game.mines)
+        safe = count_next_move(
+            board, revealed, flagged, game.mines, game.get_flag_count()
+        )
         if safe:
             for r, c in safe:
                 game.reveal(r, c)
@@ -67,7 +97,9 @@ def run_single_solve(rows, cols, mines):
             continue
 
         # Strategy 4 — CSP
-        safe, mines_found, probs = csp_next_move(board, revealed, flagged)
+        safe, mines_found, probs = csp_next_move(
+            board, revealed, flagged, constraints
+        )
         if safe or mines_found:
             for r, c in safe:
                 game.reveal(r, c)
@@ -1,7 +1,17 @@
+import sys
+import os
+
+# Bare imports below expect this directory on sys.path; the shared modules
+# (neighbors) live one level up in the package root
+_this_dir = os.path.dirname(__file__)  # .../src/mines/solver
+_pkg_root = os.path.abspath(os.path.join(_this_dir, ".."))  # .../src/mines
+if _pkg_root not in sys.path:
+    sys.path.insert(0, _pkg_root)
+
 from naive import naive_next_move
 from grouping import grouping_next_move
-from count import count_next_move
-from csp import csp_next_move
+from count import count_next_move, endgame_next_move
+from csp import csp_next_move, extract_groups
 from guess import guess_next_move
 
 def solver_next_move(board, revealed, flagged, total_mines, strategy="auto"):
@@ -23,18 +33,27 @@ def solver_next_move(board, revealed, flagged, total_mines, strategy="auto"):
         _, _, probabilities = csp_next_move(board, revealed, flagged)
         return guess_next_move(probabilities)
 
-    # AUTO = run strongest → weakest
-    safe, mines, probs = csp_next_move(board, revealed, flagged)
+    # AUTO = cheapest → most expensive, CSP only once the cheap rules run dry
+
+    # endgame: the mine count alone may settle every hidden cell
+    safe, mines = endgame_next_move(board, revealed, flagged, total_mines)
     if safe or mines:
         return safe, mines
 
+    safe, mines = naive_next_move(board, revealed, flagged)
+    if safe or mines:
+        return safe, mines
+
+    # grouping and CSP share the same frontier constraints
+    constraints = extract_groups(board, revealed, flagged)
+
     # try grouping
-    safe, mines = grouping_next_move(board, revealed, flagged)
+    safe, mines = grouping_next_move(board, revealed, flagged, constraints)
     if safe or mines:
         return safe, mines
 
-    # naive
-    safe, mines = naive_next_move(board, revealed, flagged)
+    # csp
+    safe, mines, probs = csp_next_move(board, revealed, flagged, constraints)
     if safe or mines:
         return safe, mines
 
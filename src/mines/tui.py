@@ -1,11 +1,11 @@
 """Minesweeper TUI"""
 
+import os
 import sys
 import time
 from rich.console import Console, Group
 from rich.live import Live
 from rich.panel import Panel
-from rich.table import Table
 from rich.align import Align
 from rich.text import Text
 from rich.layout import Layout
@@ -18,7 +18,7 @@ from .game import Minesweeper, CellState, GameStatus
 # Solver imports
 from .solver.naive import naive_next_move
 from .solver.grouping import grouping_next_move
-from .solver.count import count_next_move
+from .solver.count import count_next_move, endgame_next_move
 from .solver.csp import csp_next_move
 from .solver.guess import guess_next_move
 from .solver.csp import extract_groups
@@ -92,6 +92,105 @@ NUMBER_COLOR_MAP = {
 }
 
 
+# (symbol, background, foreground, bold) for every non-number cell state
+CELL_LOOKS = {
+    CellState.COVERED: (" ", COLORS["bg_covered"], None, False),
+    CellState.FLAGGED: ("⚑", COLORS["bg_flagged"], COLORS["fg_flag"], True),
+    CellState.REVEALED_MINE: ("☠", COLORS["bg_mine"], COLORS["fg_mine"], True),
+    CellState.REVEALED_EMPTY: ("·", COLORS["bg_empty"], COLORS["fg_empty"], False),
+}
+
+CURSOR_EDGE_STYLE = f"bold {COLORS['border_cursor']}"
+
+# Redraw at most ~60 times a second, however fast keys arrive
+FRAME_INTERVAL = 1 / 60
+# A key counts as released once no input has arrived for this long
+KEY_RELEASE_GAP = 0.02
+
+# DEC private mode 2026: the terminal holds a frame back until the end marker
+# and then paints it in one go (terminals without it ignore both sequences)
+SYNC_BEGIN = "\x1b[?2026h"
+SYNC_END = "\x1b[?2026l"
+
+
+def cell_style(fg: str | None, bg: str, bold: bool) -> str:
+    """Rich style string for a cell."""
+    style = []
+    if bold:
+        style.append("bold")
+    if fg:
+        style.append(fg)
+    style.append(f"on {bg}")
+    return " ".join(style)
+
+
+def make_cell_text(state: CellState, value: int | None, is_cursor: bool) -> Text:
+    """Build the styled Text for one cell look."""
+    look = CELL_LOOKS.get(state)
+    if look is not None:
+        symbol, bg, fg, bold = look
+    else:
+        symbol = str(value)
+        bg = COLORS["bg_number"]
+        fg = COLORS[NUMBER_COLOR_MAP[value]]
+        bold = True
+
+    if is_cursor:
+        bg = COLORS["bg_cursor_highlight"]
+        bold = True
+
+    text = Text(f" {symbol} ", style=cell_style(fg, bg, bold))
+
+    if is_cursor:
+        text = (
+            Text("█", style=CURSOR_EDGE_STYLE)
+            + text
+            + Text("█", style=CURSOR_EDGE_STYLE)
+        )
+
+    return text
+
+
+# Every look a cell can have, keyed by (state, value, is_cursor) as reported by
+# get_board_state(). Cells use these shared Texts directly: rows are built
+# with Text.assemble, which copies its parts, so nothing ever mutates them
+CELL_TEMPLATES: dict[tuple[CellState, int | None, bool], Text] = {
+    (state, value, is_cursor): make_cell_text(state, value, is_cursor)
+    for state, value in (
+        (CellState.COVERED, None),
+        (CellState.FLAGGED, None),
+        (CellState.REVEALED_MINE, None),
+        (CellState.REVEALED_EMPTY, 0),
+        *((CellState.REVEALED_NUMBER, n) for n in NUMBER_COLOR_MAP),
+    )
+    for is_cursor in (False, True)
+}
+
+
+def widen_cell_text(text: Text) -> Text:
+    wide = text.copy()
+    wide.align("center", 5)
+    return wide
+
+
+# The cursor's column is drawn 5 wide to fit its edges; the other cells in it
+# are widened to match, padded in their own colors
+WIDE_CELL_TEMPLATES: dict[tuple[CellState, int | None], Text] = {
+    (state, value): widen_cell_text(text)
+    for (state, value, is_cursor), text in CELL_TEMPLATES.items()
+    if not is_cursor
+}
+
+
+def centered_label(label: str, color: str, width: int) -> Text:
+    """Bold board label centered in a cell of the given width."""
+    left = (width - len(label)) // 2
+    return Text(
+        " " * left + label + " " * (width - len(label) - left),
+        style=f"bold {color}",
+    )
+
+
 def to_coord(row: int, col: int) -> str:
     return f"{chr(ord('A') + row)}{col}"
 
@@ -116,76 +215,113 @@ class MinesweeperTUI:
         self.last_key_time = 0
         self.key_repeat_delay = 0.3
 
-    # -------------------------------------------------------------
-
-    def get_cell_display(self, row, col, is_cursor=False) -> Text:
-        state = self.game.get_cell_state(row, col)
-
-        if state == CellState.COVERED:
-            symbol, bg, fg, bold = " ", COLORS["bg_covered"], None, False
-        elif state == CellState.FLAGGED:
-            symbol, bg, fg, bold = "⚑", COLORS["bg_flagged"], COLORS["fg_flag"], True
-        elif state == CellState.REVEALED_MINE:
-            symbol, bg, fg, bold = "☠", COLORS["bg_mine"], COLORS["fg_mine"], True
-        elif state == CellState.REVEALED_EMPTY:
-            symbol, bg, fg, bold = "·", COLORS["bg_empty"], COLORS["fg_empty"], False
-        else:
-            value = self.game.get_cell_value(row, col)
-            symbol = str(value)
-            bg = COLORS["bg_number"]
-            fg = COLORS[NUMBER_COLOR_MAP[value]]
-            bold = True
-
-        if is_cursor:
-            bg = COLORS["bg_cursor_highlight"]
-            bold = True
-
-        style = []
-        if bold:
-            style.append("bold")
-        if fg:
-            style.append(fg)
-        style.append(f"on {bg}")
-
-        text = Text(f" {symbol} ", style=" ".join(style))
-
-        if is_cursor:
-            text = (
-                Text("█", style=f"bold {COLORS['border_cursor']}")
-                + text
-                + Text("█", style=f"bold {COLORS['border_cursor']}")
-            )
-
-        return text
+        # Template Text drawn for each cell, with its (state, value, is_cursor)
+        # key; a cell's row is only rebuilt when that key changes
+        self._cell_texts = [[None] * cols for _ in range(rows)]
+        # The key help line never changes, so it is built once
+        self._instructions = self.render_instructions()
+        # Nor do the board's row labels; the column header only changes with
+        # the cursor column (that column is wider), so it is kept per column
+        self._row_labels = [
+            centered_label(chr(ord('A') + r), COLORS["text_row_label"], 3)
+            for r in range(rows)
+        ]
+        self._column_headers = {}
+        # Lower-cased key -> action, see handle_input
+        self._key_handlers = {
+            "w": self._move_up,
+            "s": self._move_down,
+            "a": self._move_left,
+            "d": self._move_right,
+            "e": self._act_reveal,
+            "f": self._act_flag,
+            "h": self.run_solver,
+            "c": self._act_auto,
+            "q": self._act_quit,
+        }
+
+        # Layout tree built once; each frame only updates its regions
+        self._layout = self._build_layout()
+        # solver_text the solver region was last filled from
+        self._solver_panel_text = None
+
+        # Last built board Text; reused until a move or action marks it dirty.
+        # _board_dirty means any cell may have changed, _cursor_dirty only
+        # the cells under the cursor drawn last frame (_drawn_cursor) and now.
+        # Each board line is cached in _row_texts and rebuilt only when one of
+        # its cells changes (None marks a stale row)
+        self._board_text = None
+        self._row_texts = [None] * rows
+        self._board_dirty = True
+        self._cursor_dirty = False
+        self._drawn_cursor = (0, 0)
 
     # -------------------------------------------------------------
 
-    def render_board(self) -> Table:
-        table = Table(show_header=True, box=None, padding=(0, 0))
-
-        table.add_column(" ", justify="center", width=3)
-        for c in range(self.game.cols):
-            table.add_column(
-                Text(f"{c}", style=f"bold {COLORS['text_column_label']}"),
-                justify="center", width=5 if c == self.cursor_col else 3
-            )
-
-        for r in range(self.game.rows):
-            row_label = Text(
-                f"{chr(ord('A') + r)}",
-                style=f"bold {COLORS['text_row_label']}"
-            )
-
-            row_cells = [row_label]
-
-            for c in range(self.game.cols):
-                row_cells.append(
-                    self.get_cell_display(r, c, r == self.cursor_row and c == self.cursor_col)
+    def render_board(self) -> Text:
+        if self._board_dirty:
+            # a reveal, flag or auto move may have changed any cell
+            self._refresh_all_cells()
+        elif self._cursor_dirty:
+            # only the cells under the old and new cursor look different
+            for r, c in {self._drawn_cursor, (self.cursor_row, self.cursor_col)}:
+                self._refresh_cell(
+                    r, c,
+                    self.game.get_cell_state(r, c),
+                    self.game.get_cell_value(r, c),
                 )
+        elif self._board_text is not None:
+            # nothing on the board changed since the last frame (e.g. only
+            # the solver panel did), so the previous board is still accurate
+            return self._board_text
+
+        # Every cell is a fixed-width Text, so the grid is just its lines
+        # joined up; no Table layout pass is needed
+        header = self._column_headers.get(self.cursor_col)
+        if header is None:
+            header = self._column_headers[self.cursor_col] = Text.assemble(
+                ("   ", "bold"),
+                *(
+                    centered_label(
+                        str(c), COLORS["text_column_label"],
+                        5 if c == self.cursor_col else 3,
+                    )
+                    for c in range(self.game.cols)
+                ),
+            )
 
-            table.add_row(*row_cells)
-
-        return table
+        if self.cursor_col != self._drawn_cursor[1]:
+            # every row has a cell in the old and new wide column
+            self._row_texts = [None] * self.game.rows
+
+        cursor_col = self.cursor_col
+        for r, row_text in enumerate(self._row_texts):
+            if row_text is None:
+                cells = [cached[1] for cached in self._cell_texts[r]]
+                state, value, is_cursor = self._cell_texts[r][cursor_col][0]
+                if not is_cursor:
+                    cells[cursor_col] = WIDE_CELL_TEMPLATES[(state, value)]
+                self._row_texts[r] = Text.assemble(self._row_labels[r], *cells)
+
+        self._board_text = Text("\n").join([header, *self._row_texts])
+        self._board_dirty = False
+        self._cursor_dirty = False
+        self._drawn_cursor = (self.cursor_row, self.cursor_col)
+        return self._board_text
+
+    def _refresh_all_cells(self) -> None:
+        cells = self.game.get_board_state()["cells"]
+        for r, row in enumerate(cells):
+            for c, cell in enumerate(row):
+                self._refresh_cell(r, c, cell["state"], cell["value"])
+
+    def _refresh_cell(self, r, c, state, value) -> None:
+        """Swap in the template Text for (r, c) if its look has changed."""
+        key = (state, value, r == self.cursor_row and c == self.cursor_col)
+        cached = self._cell_texts[r][c]
+        if cached is None or cached[0] != key:
+            self._cell_texts[r][c] = (key, CELL_TEMPLATES[key])
+            self._row_texts[r] = None
 
     # -------------------------------------------------------------
 
@@ -193,7 +329,7 @@ class MinesweeperTUI:
         status = self.game.get_status()
 
         if status == GameStatus.PLAYING:
-            remaining = self.game.mines - sum(sum(r) for r in self.game.flagged)
+            remaining = self.game.mines - self.game.get_flag_count()
             return Text(
                 f"⚑ {remaining} | {to_coord(self.cursor_row, self.cursor_col)}",
                 style=f"bold {COLORS['text_status_playing']}",
@@ -219,33 +355,44 @@ class MinesweeperTUI:
 
     # -------------------------------------------------------------
 
-    def render_ui(self) -> Layout:
+    def _build_layout(self) -> Layout:
+        """Build the screen skeleton; render_ui only fills in its regions."""
         layout = Layout()
 
         top = Layout()
         top.split_column(
             Layout(name="header", size=1),
             Layout(name="board"),
-            Layout(name="instructions", size=1),
-        )
-        top["header"].update(self.render_status())
-        top["board"].update(Align.center(self.render_board()))
-        top["instructions"].update(self.render_instructions())
-
-        solver_panel = Panel(
-            Group(self.solver_text),
-            title="◈ solver ◈",
-            border_style=f"bold {COLORS['border_solver']}",
-            padding=(1, 1),
+            Layout(self._instructions, name="instructions", size=1),
         )
 
         layout.split_column(
-            Layout(top, ratio=2),
-            Layout(solver_panel, ratio=1),
+            Layout(top, name="top", ratio=2),
+            Layout(name="solver", ratio=1),
         )
 
         return layout
 
+    def render_ui(self) -> Layout:
+        layout = self._layout
+        top = layout["top"].renderable
+        top["header"].update(self.render_status())
+        top["board"].update(Align.center(self.render_board()))
+
+        # the solver panel only changes when a solver run replaces solver_text
+        if self._solver_panel_text is not self.solver_text:
+            self._solver_panel_text = self.solver_text
+            layout["solver"].update(
+                Panel(
+                    Group(self.solver_text),
+                    title="◈ solver ◈",
+                    border_style=f"bold {COLORS['border_solver']}",
+                    padding=(1, 1),
+                )
+            )
+
+        return layout
+
     # =============================================================================
     # SOLVER FUNCTIONS
     # =============================================================================
@@ -256,17 +403,31 @@ class MinesweeperTUI:
         flag = self.game.flagged
         total_mines = self.game.mines
 
+        # endgame: the mine count alone may settle every hidden cell
+        safe, mines = endgame_next_move(
+            board, rev, flag, total_mines, self.game.get_flag_count()
+        )
+        if safe or mines:
+            self.show_solver_result("endgame", safe, mines)
+            return
+
         safe, mines = naive_next_move(board, rev, flag)
         if safe or mines:
             self.show_solver_result("naive", safe, mines)
             return
 
-        safe, mines = grouping_next_move(board, rev, flag)
+        # grouping, CSP and the rest-region split below all read the same
+        # frontier constraints, so extract them once
+        constraints = extract_groups(board, rev, flag)
+
+        safe, mines = grouping_next_move(board, rev, flag, constraints)
         if safe or mines:
             self.show_solver_result("grouping", safe, mines)
             return
 
-        safe = count_next_move(board, rev, flag, total_mines)
+        safe = count_next_move(
+            board, rev, flag, total_mines, self.game.get_flag_count()
+        )
         if safe:
             self.show_solver_result("count", safe, set())
             return
@@ -274,7 +435,7 @@ class MinesweeperTUI:
         # -----------------------------
         # 4) CSP Solver
         # -----------------------------
-        safe, mines, probs = csp_next_move(board, rev, flag)
+        safe, mines, probs = csp_next_move(board, rev, flag, constraints)
         if safe or mines:
             self.show_solver_result("csp", safe, mines)
             return
@@ -286,13 +447,12 @@ class MinesweeperTUI:
         # --- Hidden cells list ---
         hidden_cells = [
             (r, c)
-            for r in range(self.game.rows)
-            for c in range(self.game.cols)
-            if not rev[r][c] and not flag[r][c]
+            for r, (rev_row, flag_row) in enumerate(zip(rev, flag))
+            for c, (is_revealed, is_flagged) in enumerate(zip(rev_row, flag_row))
+            if not is_revealed and not is_flagged
         ]
 
-        flagged_count = sum(sum(row) for row in flag)
-        remaining_mines = total_mines - flagged_count
+        remaining_mines = total_mines - self.game.get_flag_count()
 
         # --- If CSP probability dictionary is empty, assign uniform probability ---
         if not probs:
@@ -306,8 +466,9 @@ class MinesweeperTUI:
 
        # 6) Identify constrained vs unconstrained cells
         constrained_cells = set()
-        for g in extract_groups(board, rev, flag):
-            constrained_cells |= g.cells
+        for g in constraints:
+            # group cells are flat ids r * cols + c
+            constrained_cells.update(divmod(cell, self.game.cols) for cell in g.cells)
 
         unconstrained_cells = set(hidden_cells) - constrained_cells
 
@@ -363,6 +524,13 @@ class MinesweeperTUI:
         flag = self.game.flagged
         total_mines = self.game.mines
 
+        safe, mines = endgame_next_move(
+            board, rev, flag, total_mines, self.game.get_flag_count()
+        )
+        if safe or mines:
+            self._apply_moves("endgame", safe, mines)
+            return
+
         safe, mines = naive_next_move(board, rev, flag)
         if safe or mines:
             self._apply_moves("naive", safe, mines)
@@ -373,7 +541,9 @@ class MinesweeperTUI:
             self._apply_moves("grouping", safe, mines)
             return
 
-        safe = count_next_move(board, rev, flag, total_mines)
+        safe = count_next_move(
+            board, rev, flag, total_mines, self.game.get_flag_count()
+        )
         if safe:
             self._apply_moves("count", safe, set())
             return
@@ -421,7 +591,10 @@ class MinesweeperTUI:
         if key is None:
             return False
 
-        if self.game.is_game_over() and key.lower() not in ("h", "c", "q"):
+        # keys are case-insensitive; lower-case once for all the checks below
+        k = key.lower()
+
+        if self.game.is_game_over() and k not in ("h", "c", "q"):
             return False
 
         process = False
@@ -430,7 +603,7 @@ class MinesweeperTUI:
             process = True
             self.last_key = key
             self.last_key_time = now
-        elif key.lower() in {"w", "a", "s", "d"}:
+        elif k in {"w", "a", "s", "d"}:
             if now - self.last_key_time >= self.key_repeat_delay:
                 process = True
                 self.last_key_time = now
@@ -439,73 +612,143 @@ class MinesweeperTUI:
             return False
 
         # Movement and game actions
-        if key.lower() == "w":
-            self.cursor_row = max(0, self.cursor_row - 1)
-        elif key.lower() == "s":
-            self.cursor_row = min(self.game.rows - 1, self.cursor_row + 1)
-        elif key.lower() == "a":
-            self.cursor_col = max(0, self.cursor_col - 1)
-        elif key.lower() == "d":
-            self.cursor_col = min(self.game.cols - 1, self.cursor_col + 1)
-        elif key.lower() == "e":
-            self.game.reveal(self.cursor_row, self.cursor_col)
-        elif key.lower() == "f":
-            self.game.flag(self.cursor_row, self.cursor_col)
-        elif key.lower() == "h":
-            self.run_solver()
-        elif key.lower() == "c":
-            self.apply_solver_moves()
-        elif key.lower() == "q":
-            self.running = False
+        handler = self._key_handlers.get(k)
+        if handler is not None:
+            handler()
 
         return True
 
+    # Key handlers; the ones that can change the board mark it for redrawing
+
+    def _move_up(self):
+        self.cursor_row = max(0, self.cursor_row - 1)
+        self._cursor_dirty = True
+
+    def _move_down(self):
+        self.cursor_row = min(self.game.rows - 1, self.cursor_row + 1)
+        self._cursor_dirty = True
+
+    def _move_left(self):
+        self.cursor_col = max(0, self.cursor_col - 1)
+        self._cursor_dirty = True
+
+    def _move_right(self):
+        self.cursor_col = min(self.game.cols - 1, self.cursor_col + 1)
+        self._cursor_dirty = True
+
+    def _act_reveal(self):
+        self.game.reveal(self.cursor_row, self.cursor_col)
+        self._board_dirty = True
+
+    def _act_flag(self):
+        self.game.flag(self.cursor_row, self.cursor_col)
+        self._board_dirty = True
+
+    def _act_auto(self):
+        self.apply_solver_moves()
+        self._board_dirty = True
+
+    def _act_quit(self):
+        self.running = False
+
     # =============================================================================
     # GAME LOOP
     # =============================================================================
 
+    def draw(self, live: Live) -> None:
+        """Push a new frame, wrapped in a synchronized update on real terminals."""
+        if not self.console.is_terminal:
+            live.update(self.render_ui(), refresh=True)
+            return
+
+        out = self.console.file
+        out.write(SYNC_BEGIN)
+        try:
+            # Live writes and flushes the whole frame in one go
+            live.update(self.render_ui(), refresh=True)
+        finally:
+            out.write(SYNC_END)
+            out.flush()
+
     def run(self):
         old_settings = None
 
         try:
+            # get_keys(timeout) waits up to timeout seconds for input (None
+            # means until some arrives) and returns every key read, or None
             if sys.platform == "win32":
                 import msvcrt
 
-                def get_key():
-                    return msvcrt.getch().decode() if msvcrt.kbhit() else None
+                def get_keys(timeout):
+                    if msvcrt.kbhit():
+                        return msvcrt.getch().decode()
+                    time.sleep(0.02 if timeout is None else timeout)
+                    return None
 
             else:
                 old_settings = termios.tcgetattr(sys.stdin)
                 tty.setcbreak(sys.stdin.fileno())
 
-                def get_key():
-                    if select.select([sys.stdin], [], [], 0)[0]:
-                        return sys.stdin.read(1)
+                stdin_fd = sys.stdin.fileno()
+
+                def get_keys(timeout):
+                    # one read drains everything typed or pasted since the
+                    # last wake, instead of one select/read per byte
+                    if select.select([stdin_fd], [], [], timeout)[0]:
+                        return os.read(stdin_fd, 32).decode(errors="ignore")
                     return None
 
+            # No auto refresh: Live then starts no refresh thread, and every
+            # frame comes from draw() when input actually changed something
             with Live(
                 self.render_ui(),
                 console=self.console,
-                refresh_per_second=10,
                 screen=True,
                 auto_refresh=False,
             ) as live:
 
                 held = False
+                last_input = 0.0
+                # key batches since the last frame; drawn at most once per
+                # FRAME_INTERVAL so a held or pasted key doesn't redraw per key
+                pending = False
+                last_draw = 0.0
 
                 while self.running:
+                    # Sleep until a key arrives, waking early only to flush a
+                    # pending frame or to notice that a held key was released
+                    now = time.time()
+                    deadlines = []
+                    if pending:
+                        deadlines.append(last_draw + FRAME_INTERVAL)
+                    if held:
+                        deadlines.append(last_input + KEY_RELEASE_GAP)
+                    timeout = max(0.0, min(deadlines) - now) if deadlines else None
+
+                    keys = get_keys(timeout)
                     now = time.time()
-                    key = get_key()
 
-                    if key:
+                    if keys:
                         held = True
-                        if self.handle_input(key, now):
-                            live.update(self.render_ui(), refresh=True)
-                    else:
-                        if held:
-                            self.last_key = None
-                            held = False
-                        time.sleep(0.02)
+                        last_input = now
+                        for key in keys:
+                            if self.handle_input(key, now):
+                                pending = True
+                            if not self.running:
+                                break
+                    elif held and now - last_input >= KEY_RELEASE_GAP:
+                        self.last_key = None
+                        held = False
+
+                    if not self.running:
+                        break
+                    # the end of a game is shown right away, not a frame later
+                    if pending and (
+                        now - last_draw >= FRAME_INTERVAL or self.game.is_game_over()
+                    ):
+                        self.draw(live)
+                        last_draw = now
+                        pending = False
 
         finally:
             if sys.platform != "win32" and old_settings is not None: